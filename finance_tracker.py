@@ -1,14 +1,208 @@
+import argparse
+import atexit
+import bisect
 import csv
 from datetime import datetime
 import calendar
+import math
+from collections import defaultdict
 import os
-import matplotlib.pyplot as plt
+import re
+import sys
+from contextlib import contextmanager
+from operator import attrgetter
+
+# Integer tags for transaction types, compared instead of the type strings.
+# Types other than income and expense are kept but tagged OTHER.
+INCOME, EXPENSE, OTHER = 0, 1, -1
+_TXN_CODES = {"income": INCOME, "expense": EXPENSE}
+
+# Month names indexed by month number, with "" at index 0.
+MONTH_NAME = list(calendar.month_name)
+
+# Sort key for ordering transactions by date.
+_BY_DATE = attrgetter("date")
+
+# Shape of an amount typed by the user, e.g. "12", "-3.50", ".5" or "1e3".
+_AMOUNT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?", re.ASCII)
+
+# Accepted answers to yes/no prompts.
+_YES_NO = {"y": True, "yes": True, "n": False, "no": False}
+
+# Transaction types accepted from the user.
+_TXN_TYPES = frozenset({"income", "expense"})
+
+# Bits of the FT_REPORTS environment variable, which answers the report
+# questions up front when input is piped, e.g. FT_REPORTS=5 for analysis and charts.
+REPORT_ANALYSIS, REPORT_FILTER, REPORT_CHARTS = 1, 2, 4
+
+# Where the interactive prompts keep their line history between sessions.
+HISTORY_FILE = os.path.expanduser("~/.finance_tracker_history")
+
+# Parsed "YYYY-MM-DD" strings, shared by every Transaction. Ledgers repeat
+# the same dates many times, so each distinct string is parsed only once.
+_DATE_CACHE = {}
+
+
+def _split_ymd(date):
+    """
+    Slice the fields out of a zero-padded "YYYY-MM-DD" string.
+
+    Much cheaper than strptime, which re-interprets its format on every call.
+
+    Args:
+        date (str): The date string to split.
+
+    Returns:
+        tuple: (year, month, day) as ints, or None if the string is not
+        exactly four digits, a dash, two digits, a dash and two digits.
+        The fields are not checked against the calendar.
+    """
+    if len(date) != 10 or date[4] != "-" or date[7] != "-":
+        return None
+    digits = date[:4] + date[5:7] + date[8:]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return int(date[:4]), int(date[5:7]), int(date[8:])
+
+
+def _scan_ymd(date):
+    """
+    Parse a zero-padded "YYYY-MM-DD" string without strptime.
+
+    Args:
+        date (str): The date string to parse.
+
+    Returns:
+        datetime: The parsed date, or None if the string is not in that shape.
+
+    Raises:
+        ValueError: If the fields do not form a real date.
+    """
+    fields = _split_ymd(date)
+    if fields is None:
+        return None
+    return datetime(*fields)
+
+
+def _parse_date(date):
+    """
+    Parse a "YYYY-MM-DD" string into a datetime, reusing earlier results.
+
+    Args:
+        date (str): The date string to parse.
+
+    Returns:
+        datetime: The parsed date.
+    """
+    parsed = _DATE_CACHE.get(date)
+    if parsed is None:
+        parsed = _scan_ymd(date)
+        if parsed is None:
+            # Unpadded forms such as "2025-1-5" still go through strptime.
+            parsed = datetime.strptime(date, "%Y-%m-%d")
+        _DATE_CACHE[date] = parsed
+    return parsed
+
+
+def _validate_iso_date(date):
+    """
+    Check that a string is a real calendar date written as "YYYY-MM-DD".
+
+    Checks the fields directly rather than building a datetime, so invalid
+    input never raises.
+
+    Args:
+        date (str): The string to check.
+
+    Returns:
+        bool: True if the date is valid.
+    """
+    fields = _split_ymd(date)
+    if fields is None:
+        return False
+    year, month, day = fields
+    if year < 1 or not 1 <= month <= 12:
+        return False
+    return 1 <= day <= calendar.monthrange(year, month)[1]
+
+
+def _typed_date(text):
+    """Return text if it is a valid "YYYY-MM-DD" date, otherwise None."""
+    return text if _validate_iso_date(text) else None
+
+
+def _typed_optional_date(text):
+    """Return text if it is empty or a valid "YYYY-MM-DD" date, otherwise None."""
+    return text if text == "" else _typed_date(text)
+
+
+def _typed_txn_type(text):
+    """Return the trimmed, lowercased type if it is valid, otherwise None."""
+    txn_type = text.strip().lower()
+    return sys.intern(txn_type) if txn_type in _TXN_TYPES else None
+
+
+def _typed_amount(text):
+    """Return text as a finite float if it looks like a number, otherwise None."""
+    text = text.strip()
+    if not _AMOUNT_RE.fullmatch(text):
+        return None
+    # Huge exponents such as "1e999" match the pattern but overflow to inf.
+    amount = float(text)
+    return amount if math.isfinite(amount) else None
+
+
+def _pyplot():
+    """
+    Import matplotlib.pyplot on first use.
+
+    Loading matplotlib is slow, so runs that never draw a chart skip it.
+
+    Returns:
+        module: matplotlib.pyplot.
+
+    Raises:
+        RuntimeError: If matplotlib is not installed.
+    """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        raise RuntimeError("Install matplotlib to display charts.") from None
+    return plt
+
+
+def _ask(prompt):
+    """
+    Show a prompt and read one line of user input.
+
+    On a terminal this is input(). When stdin is piped, the line is read
+    straight from the buffered sys.stdin and stdout is not flushed after
+    every prompt, which input() would do.
+
+    Args:
+        prompt (str): The text to prompt the user with.
+
+    Returns:
+        str: The line entered, without its trailing newline.
+
+    Raises:
+        EOFError: If piped input has run out.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError("EOF when reading a line")
+    return line[:-1] if line.endswith("\n") else line
 
 
 def yes_or_no(prompt):
     """
     Prompt the user with a yes/no question and return True for 'yes' and False for 'no'.
 
+    Also accepts 'y' and 'n', in any case and with surrounding spaces.
     Repeats until the user enters a valid response.
 
     Args:
@@ -18,13 +212,64 @@ def yes_or_no(prompt):
         bool: True if user answers 'yes', False if 'no'.
     """
     while True:
-        user_input = input(prompt + ", yes or no? ")
-        if user_input.lower() == "yes":
-            return True
-        elif user_input.lower() == "no":
-            return False
-        else:
-            print("Invalid response")
+        answer = _YES_NO.get(_ask(prompt + ", yes or no? ").strip().lower())
+        if answer is not None:
+            return answer
+        print("Invalid response")
+
+
+def _report_flags():
+    """
+    Read the reports requested through FT_REPORTS for a piped session.
+
+    Returns:
+        int: The REPORT_* bits requested, or None if stdin is a terminal or
+        FT_REPORTS is unset or not a number.
+    """
+    flags = os.environ.get("FT_REPORTS")
+    if flags is None or sys.stdin.isatty():
+        return None
+    flags = flags.strip()
+    if not (flags.isascii() and flags.isdigit()):
+        return None
+    return int(flags)
+
+
+def _wants_report(flags, bit, prompt):
+    """
+    Decide whether to produce a report, asking only when no flags were given.
+
+    Args:
+        flags (int): Result of _report_flags.
+        bit (int): The REPORT_* bit for this report.
+        prompt (str): The yes/no question to ask otherwise.
+
+    Returns:
+        bool: True if the report should be produced.
+    """
+    if flags is None:
+        return yes_or_no(prompt)
+    return bool(flags & bit)
+
+
+def prompt_validated(prompt, validator, error):
+    """
+    Prompt the user until the validator accepts their input.
+
+    Args:
+        prompt (str): The text to prompt the user with.
+        validator (callable): Takes the raw input and returns the parsed
+            value, or None if the input is invalid.
+        error (str): Message printed after each invalid input.
+
+    Returns:
+        The first value the validator did not reject.
+    """
+    while True:
+        value = validator(_ask(prompt))
+        if value is not None:
+            return value
+        print(error)
 
 
 class Transaction:
@@ -34,14 +279,36 @@ class Transaction:
     Attributes:
         date (datetime): The date of the transaction.
         txn_type (str): Type of transaction ('income' or 'expense').
+        type_code (int): INCOME, EXPENSE, or OTHER for any other type.
         amount (float): Amount of money for the transaction.
         category (str): Category of the transaction.
     """
+    __slots__ = ("date", "txn_type", "type_code", "amount", "category", "_row")
+
     def __init__(self, date, txn_type, amount, category):
-        self.date = datetime.strptime(date, "%Y-%m-%d")
-        self.txn_type = txn_type.strip().lower()
+        self.date = _parse_date(date)
+        # Types and categories repeat across rows, so share one string each.
+        self.txn_type = sys.intern(txn_type.strip().lower())
+        self.type_code = _TXN_CODES.get(self.txn_type, OTHER)
         self.amount = amount
-        self.category = category
+        self.category = sys.intern(category)
+        self._row = None
+
+    def as_row(self):
+        """
+        Returns the transaction as a file row, formatting it only once.
+
+        Returns:
+            tuple: Date, type, amount and category as strings.
+        """
+        if self._row is None:
+            self._row = (
+                self.date.strftime("%Y-%m-%d"),
+                self.txn_type,
+                f"{self.amount:.2f}",
+                self.category,
+            )
+        return self._row
 
     def __str__(self):
         """Returns a formatted string representation of the transaction."""
@@ -62,6 +329,8 @@ class FinanceTracker:
     def __init__(self):
         """Initializes the FinanceTracker with an empty list of transactions."""
         self.transactions = []
+        self._cache = {}
+        self._cache_source = None
 
     def add_transaction(self, transaction):
         """Adds a transaction object to a list.
@@ -70,21 +339,91 @@ class FinanceTracker:
             transaction (Transaction): the transaction to add.
         """
         self.transactions.append(transaction)
+        self._cache = {}
 
-    def calc_current_balance(self):
+    def _cached(self, name, build):
         """
-        Calculates the net balance (income - expenses).
+        Internal method to reuse data derived from the transactions.
+
+        Everything cached is dropped once a transaction is added or the
+        transactions list is replaced.
+
+        Args:
+            name (str): Cache key.
+            build (callable): Builds the value when it is not cached.
 
         Returns:
-            str: Net balance formatted to 2 decimal places.
+            The cached or newly built value.
+        """
+        source = (self.transactions, len(self.transactions))
+        if (
+            self._cache_source is None
+            or self._cache_source[0] is not source[0]
+            or self._cache_source[1] != source[1]
+        ):
+            self._cache = {}
+            self._cache_source = source
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def _sorted_by_date(self):
+        """
+        Internal method returning the transactions sorted by date.
+
+        Returns:
+            tuple: (list of dates, list of transactions), both in date order.
+        """
+        return self._cached("sorted_by_date", self._build_sorted_by_date)
+
+    def _build_sorted_by_date(self):
+        """Builds the lists returned by _sorted_by_date."""
+        txns = sorted(self.transactions, key=_BY_DATE)
+        dates = [txn.date for txn in txns]
+        return dates, txns
+
+    def _date_range(self, date1, date2=None):
+        """
+        Internal method to find transactions on a date or within a date range.
+
+        Args:
+            date1 (str): Start date in "YYYY-MM-DD" format.
+            date2 (str, optional): End date in "YYYY-MM-DD" format.
+
+        Returns:
+            list: Matching transactions sorted by date.
+        """
+        start = _parse_date(date1)
+        end = _parse_date(date2) if date2 is not None else start
+        dates, txns = self._sorted_by_date()
+        lo = bisect.bisect_left(dates, start)
+        hi = bisect.bisect_right(dates, end)
+        return txns[lo:hi]
+
+    def _totals(self):
+        """
+        Internal method to sum income and expenses in a single pass.
+
+        Returns:
+            tuple: (total income, total expenses)
         """
         income = 0
         expense = 0
         for transaction in self.transactions:
-            if transaction.txn_type == "income":
+            if transaction.type_code == INCOME:
                 income += transaction.amount
-            elif transaction.txn_type == "expense":
+            elif transaction.type_code == EXPENSE:
                 expense += transaction.amount
+        return income, expense
+
+    def calc_current_balance(self):
+        """
+        Calculates the net balance (income - expenses).
+
+        Returns:
+            str: Net balance formatted to 2 decimal places.
+        """
+        income, expense = self._totals()
         return f"{income - expense:.2f}"
 
     def get_total_income(self):
@@ -94,10 +433,7 @@ class FinanceTracker:
         Returns:
             str: Total income formatted to 2 decimal places.
         """
-        income = 0
-        for transaction in self.transactions:
-            if transaction.txn_type == "income":
-                income += transaction.amount
+        income, _ = self._totals()
         return f"{income:.2f}"
 
     def get_total_expenses(self):
@@ -107,12 +443,24 @@ class FinanceTracker:
         Returns:
             str: Total expenses formatted as a string with two decimal places.
         """
-        expense = 0
-        for transaction in self.transactions:
-            if transaction.txn_type == "expense":
-                expense += transaction.amount
+        _, expense = self._totals()
         return f"{expense:.2f}"
 
+    def categories(self):
+        """
+        Returns the distinct categories of the transactions.
+
+        Cached until a transaction is added or the transactions list is replaced.
+
+        Returns:
+            set: Category names.
+        """
+        return self._cached("categories", self._build_categories)
+
+    def _build_categories(self):
+        """Builds the set returned by categories."""
+        return {txn.category for txn in self.transactions}
+
     def category_filter(self, category):
         """
         Filters transactions by category.
@@ -123,11 +471,8 @@ class FinanceTracker:
         Returns:
             list: Transactions matching the specified category.
         """
-        category_list = []
-        for transaction in self.transactions:
-            if transaction.category == category:
-                category_list.append(transaction)
-        return category_list
+        # Categories are interned, so most comparisons are identity checks.
+        return [txn for txn in self.transactions if txn.category == category]
 
     def date_filter(self, date1, date2=None):
         """
@@ -140,20 +485,7 @@ class FinanceTracker:
         Returns:
             list: Filtered transactions sorted by date.
         """
-        date_list = []
-
-        for transaction in self.transactions:
-            if date2 is None:
-                if transaction.date == datetime.strptime(date1, "%Y-%m-%d"):
-                    date_list.append(transaction)
-            else:
-                start = datetime.strptime(date1, "%Y-%m-%d")
-                end = datetime.strptime(date2, "%Y-%m-%d")
-                if start <= transaction.date <= end:
-                    date_list.append(transaction)
-
-        date_list = sorted(date_list, key=lambda txn: txn.date)
-        return date_list
+        return self._date_range(date1, date2)
 
     def _date_filter_by_type(self, date1, date2, filter):
         """
@@ -162,33 +494,24 @@ class FinanceTracker:
         Args:
             date1 (str): Start date.
             date2 (str): End date.
-            filter (str): 'income' or 'expense'.
+            filter (int): INCOME or EXPENSE.
 
         Returns:
             list: Filtered transactions sorted by date.
         """
         date_list = []
-        for transaction in self.transactions:
-            if transaction.txn_type == filter:
-                if date2 is None:
-                    if transaction.date == datetime.strptime(date1, "%Y-%m-%d"):
-                        date_list.append(transaction)
-                else:
-                    start = datetime.strptime(date1, "%Y-%m-%d")
-                    end = datetime.strptime(date2, "%Y-%m-%d")
-                    if start <= transaction.date <= end:
-                        date_list.append(transaction)
-
-        date_list = sorted(date_list, key=lambda txn: txn.date)
+        for transaction in self._date_range(date1, date2):
+            if transaction.type_code == filter:
+                date_list.append(transaction)
         return date_list
 
     def date_income_filter(self, date1, date2):
         """Returns income transactions within a date range."""
-        return self._date_filter_by_type(date1, date2, "income")
+        return self._date_filter_by_type(date1, date2, INCOME)
 
     def date_expense_filter(self, date1, date2):
         """Returns expense transactions within a date range."""
-        return self._date_filter_by_type(date1, date2, "expense")
+        return self._date_filter_by_type(date1, date2, EXPENSE)
 
     def date_category_filter(self, date1, date2, category):
         """
@@ -203,18 +526,9 @@ class FinanceTracker:
             list: Filtered and sorted transactions.
         """
         date_list = []
-        for transaction in self.transactions:
+        for transaction in self._date_range(date1, date2):
             if transaction.category == category:
-                if date2 is None:
-                    if transaction.date == datetime.strptime(date1, "%Y-%m-%d"):
-                        date_list.append(transaction)
-                else:
-                    start = datetime.strptime(date1, "%Y-%m-%d")
-                    end = datetime.strptime(date2, "%Y-%m-%d")
-                    if start <= transaction.date <= end:
-                        date_list.append(transaction)
-
-        date_list = sorted(date_list, key=lambda txn: txn.date)
+                date_list.append(transaction)
         return date_list
 
 
@@ -227,6 +541,24 @@ class Storage:
     """
     def __init__(self, tracker):
         self.tracker = tracker
+        # Files known to exist already, so appends can skip the existence check.
+        self._known_files = set()
+
+    def _delimiter(self, filename):
+        """
+        Internal method to pick the field delimiter from the file extension.
+
+        Args:
+            filename (str): The file name.
+
+        Returns:
+            str: "," for .csv, a tab for .tsv, or None for anything else.
+        """
+        if filename.lower().endswith(".csv"):
+            return ","
+        elif filename.lower().endswith(".tsv"):
+            return "\t"
+        return None
 
     def read_transaction(self, filename):
         """
@@ -235,28 +567,20 @@ class Storage:
         Args:
             filename (str): The name of the file to read.
         """
-        if filename.lower().endswith(".csv"):
-            with open(filename, "r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter=",")
-                next(csv_reader)
-                for line in csv_reader:
-                    date = line[0]
-                    txn_type = line[1]
-                    amount = round(float(line[2]), 2)
-                    category = line[3]
-                    read_txn = Transaction(date, txn_type, amount, category)
-                    self.tracker.add_transaction(read_txn)
-        elif filename.lower().endswith(".tsv"):
-            with open(filename, "r") as csv_file:
-                csv_reader = csv.reader(csv_file, delimiter="\t")
-                next(csv_reader)
-                for line in csv_reader:
-                    date = line[0]
-                    txn_type = line[1]
-                    amount = round(float(line[2]), 2)
-                    category = line[3]
-                    read_txn = Transaction(date, txn_type, amount, category)
-                    self.tracker.add_transaction(read_txn)
+        delimiter = self._delimiter(filename)
+        if delimiter is None:
+            return
+
+        # Bound to locals so the per-row loop skips global and attribute lookups.
+        add_transaction = self.tracker.add_transaction
+        transaction = Transaction
+
+        with open(filename, "r") as csv_file:
+            csv_reader = csv.reader(csv_file, delimiter=delimiter)
+            next(csv_reader)
+            for line in csv_reader:
+                amount = round(float(line[2]), 2)
+                add_transaction(transaction(line[0], line[1], amount, line[3]))
 
     def append_transaction(self, filename, transaction):
         """
@@ -266,40 +590,48 @@ class Storage:
             filename (str): The file to write to.
             transaction (Transaction): The transaction to append.
         """
-        file_is_new = not os.path.exists(filename)
-        if filename.lower().endswith(".csv"):
-            with open(filename, "a", newline="", encoding="utf-8") as csv_file:
-                csv_append = csv.writer(csv_file, delimiter=",")
-                titlenames = ["Date", "Txn Type", "Amount", "Category"]
-
-                if file_is_new:
-                    csv_append.writerow(titlenames)
-
-                csv_append.writerow(
-                    [
-                        transaction.date.strftime("%Y-%m-%d"),
-                        transaction.txn_type,
-                        f"{transaction.amount:.2f}",
-                        transaction.category,
-                    ]
-                )
+        self._append_rows(filename, [transaction], sync=False)
 
-        elif filename.lower().endswith(".tsv"):
-            with open(filename, "a", newline="", encoding="utf-8") as csv_file:
-                csv_append = csv.writer(csv_file, delimiter="\t")
-                titlenames = ["Date", "Txn Type", "Amount", "Category"]
-
-                if file_is_new:
-                    csv_append.writerow(titlenames)
-
-                csv_append.writerow(
-                    [
-                        transaction.date.strftime("%Y-%m-%d"),
-                        transaction.txn_type,
-                        f"{transaction.amount:.2f}",
-                        transaction.category,
-                    ]
-                )
+    def append_transactions(self, filename, transactions):
+        """
+        Appends several transactions to a CSV or TSV file in one write.
+
+        The file is opened, flushed and synced to disk once for the whole batch.
+
+        Args:
+            filename (str): The file to write to.
+            transactions (list): The Transaction objects to append.
+        """
+        self._append_rows(filename, transactions, sync=True)
+
+    def _append_rows(self, filename, transactions, sync):
+        """
+        Internal method to append transactions, writing the header to a new file.
+
+        Args:
+            filename (str): The file to write to.
+            transactions (list): The Transaction objects to append.
+            sync (bool): Whether to sync the file to disk before closing it.
+        """
+        delimiter = self._delimiter(filename)
+        if delimiter is None:
+            return
+
+        file_is_new = filename not in self._known_files and not os.path.exists(filename)
+        self._known_files.add(filename)
+        with open(
+            filename, "a", newline="", encoding="utf-8", buffering=1 << 16
+        ) as csv_file:
+            csv_append = csv.writer(csv_file, delimiter=delimiter)
+            titlenames = ["Date", "Txn Type", "Amount", "Category"]
+
+            if file_is_new:
+                csv_append.writerow(titlenames)
+
+            csv_append.writerows(txn.as_row() for txn in transactions)
+            if sync:
+                csv_file.flush()
+                os.fsync(csv_file.fileno())
 
 
 class ReportingAndAnalysis:
@@ -318,15 +650,123 @@ class ReportingAndAnalysis:
         self.filename = filename
         self.tracker = tracker
         self.use_file = use_file
+        self._synced = False
+        self._aggregates = None
+        self._loaded = None
+
+    def refresh(self):
+        """
+        Re-read the transactions from the file, even if it looks unchanged.
+
+        Reports and charts already skip the read while the file and the
+        tracker are unchanged since the last one. Call this first if the file
+        may have been rewritten without its size or modification time changing.
+        """
+        self._loaded = None
+        self._sync_transactions()
 
     def _sync_transactions(self):
         """
         Sync transactions from the file into the tracker if use_file is True.
+
+        Does nothing while inside a _single_sync block that has already synced,
+        or when neither the file nor the tracker's transactions changed since
+        the last read.
+        """
+        if not self.use_file or self._synced:
+            return
+
+        stat = os.stat(self.filename)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        transactions = self.tracker.transactions
+        if (
+            self._loaded is not None
+            and self._loaded[0] == signature
+            and self._loaded[1] is transactions
+            and self._loaded[2] == len(transactions)
+        ):
+            return
+
+        self._aggregates = None
+        self.tracker.transactions = []
+        storage = Storage(self.tracker)
+        storage.read_transaction(self.filename)
+        transactions = self.tracker.transactions
+        self._loaded = (signature, transactions, len(transactions))
+
+    @contextmanager
+    def _single_sync(self):
         """
-        if self.use_file:
-            self.tracker.transactions = []
-            storage = Storage(self.tracker)
-            storage.read_transaction(self.filename)
+        Sync once, then skip further syncs until the outermost block exits.
+
+        Lets a report built from several aggregations read the file a single
+        time instead of once per aggregation.
+        """
+        if self._synced:
+            yield
+            return
+        self._sync_transactions()
+        self._synced = True
+        try:
+            yield
+        finally:
+            self._synced = False
+            self._aggregates = None
+
+    def compute_all_aggregates(self):
+        """
+        Compute every report total in one pass, for sharing across charts.
+
+        Pass the result to the chart methods so that drawing several charts
+        does not aggregate the transactions again for each one.
+
+        Returns:
+            dict: Totals grouped by transaction type, as built by _aggregate_all.
+        """
+        with self._single_sync():
+            return self._aggregate_all()
+
+    def _aggregate_all(self):
+        """
+        Aggregate every total used by the reports in a single pass.
+
+        Inside a _single_sync block the result is reused by later calls.
+
+        Returns:
+            dict: {txn_type: groups} for 'income' and 'expense', where groups
+            holds "total", "monthly", "monthly_categories" and "categories"
+            in the shapes returned by the matching public methods. The
+            grouped dicts are unordered; sort them where order matters.
+        """
+        if self._aggregates is not None:
+            return self._aggregates
+
+        self._sync_transactions()
+        aggregates = {}
+        by_code = {}
+        for txn_type, type_code in _TXN_CODES.items():
+            aggregates[txn_type] = by_code[type_code] = {
+                "total": 0.0,
+                "monthly": defaultdict(float),
+                "monthly_categories": defaultdict(float),
+                "categories": defaultdict(float),
+            }
+
+        for txn in self.tracker.transactions:
+            groups = by_code.get(txn.type_code)
+            if groups is None:
+                continue
+
+            amount = txn.amount
+            tuple_date = (txn.date.year, txn.date.month)
+            groups["total"] += amount
+            groups["monthly"][tuple_date] += amount
+            groups["monthly_categories"][(tuple_date, txn.category)] += amount
+            groups["categories"][txn.category] += amount
+
+        if self._synced:
+            self._aggregates = aggregates
+        return aggregates
 
     def _monthly_basis(self, txn_type):
         """
@@ -337,21 +777,9 @@ class ReportingAndAnalysis:
 
         Returns:
             dict: {(year, month): total_amount}
+            Unordered; sort the items for display.
         """
-        self._sync_transactions()
-        all_txn = self.tracker.transactions
-        months_dict = {}
-
-        for txn in all_txn:
-            tuple_date = (txn.date.year, txn.date.month)
-            if txn.txn_type == txn_type:
-                if tuple_date in months_dict:
-                    months_dict[tuple_date] += txn.amount
-                else:
-                    months_dict[tuple_date] = txn.amount
-
-        months_dict = dict(sorted(months_dict.items()))
-        return months_dict
+        return self._aggregate_all()[txn_type]["monthly"]
 
     def monthly_income(self):
         """Return monthly income totals."""
@@ -365,19 +793,37 @@ class ReportingAndAnalysis:
         """
         Calculate net savings per month.
 
+        Months with only income or only expenses are included, with the
+        missing side counted as zero.
+
         Returns:
             dict: {(year, month): income - expenses}
         """
-        income_dict = self.monthly_income()
-        expenses_dict = self.monthly_expenses()
+        with self._single_sync():
+            income_dict = self.monthly_income()
+            expenses_dict = self.monthly_expenses()
+        return self._net_savings(income_dict, expenses_dict)
+
+    def _net_savings(self, income_dict, expenses_dict):
+        """
+        Subtract monthly expenses from monthly income.
+
+        Args:
+            income_dict (dict): {(year, month): income}
+            expenses_dict (dict): {(year, month): expenses}
+
+        Returns:
+            dict: {(year, month): income - expenses}, in month order.
+        """
+        months = sorted(income_dict.keys() | expenses_dict.keys())
+
         months_dict = {}
 
-        for tuple_1, income in income_dict.items():
-            for tuple_2, expense in expenses_dict.items():
-                if tuple_1 == tuple_2:
-                    months_dict[tuple_1] = income - expense
+        for tuple_date in months:
+            income = income_dict.get(tuple_date, 0)
+            expense = expenses_dict.get(tuple_date, 0)
+            months_dict[tuple_date] = income - expense
 
-        months_dict = dict(sorted(months_dict.items()))
         return months_dict
 
     def _monthly_categories_basis(self, txn_type):
@@ -389,23 +835,9 @@ class ReportingAndAnalysis:
 
         Returns:
             dict: {((year, month), category): total_amount}
+            Unordered; sort the items for display.
         """
-        self._sync_transactions()
-        all_txn = self.tracker.transactions
-        months_dict = {}
-
-        for txn in all_txn:
-            tuple_1 = (txn.date.year, txn.date.month)
-            tuple_2 = (tuple_1, txn.category)
-
-            if txn.txn_type == txn_type:
-                if tuple_2 in months_dict:
-                    months_dict[tuple_2] += txn.amount
-                else:
-                    months_dict[tuple_2] = txn.amount
-
-        months_dict = dict(sorted(months_dict.items()))
-        return months_dict
+        return self._aggregate_all()[txn_type]["monthly_categories"]
 
     def monthly_income_categories(self):
         """Return monthly income grouped by category."""
@@ -424,20 +856,9 @@ class ReportingAndAnalysis:
 
         Returns:
             dict: {category: total_amount}
+            Unordered; sort the items for display.
         """
-        self._sync_transactions()
-        all_txn = self.tracker.transactions
-        txn_dict = {}
-
-        for txn in all_txn:
-            if txn.txn_type == txn_type:
-                if txn.category in txn_dict:
-                    txn_dict[txn.category] += txn.amount
-                else:
-                    txn_dict[txn.category] = txn.amount
-
-        txn_dict = dict(sorted(txn_dict.items()))
-        return txn_dict
+        return self._aggregate_all()[txn_type]["categories"]
 
     def totals_each_income_category(self):
         """Return total income for each category."""
@@ -451,87 +872,87 @@ class ReportingAndAnalysis:
         """
         Export various financial summaries and analyses to 'analysis.tsv'.
         """
-        self._sync_transactions()
-        monthly_net_savings_txns = self.monthly_net_savings()
-        monthly_income_txns = self.monthly_income()
-        monthly_expenses_txns = self.monthly_expenses()
-        monthly_income_categories_txns = self.monthly_income_categories()
-        monthly_expenses_categories_txns = self.monthly_expenses_categories()
-        totals_each_income_category_txns = self.totals_each_income_category()
-        totals_each_expense_category_txns = self.totals_each_expense_category()
-
-        with open("analysis.tsv", "w", newline="") as csv_file:
+        with self._single_sync():
+            aggregates = self._aggregate_all()
+            monthly_net_savings_txns = self.monthly_net_savings()
+
+        income = aggregates["income"]
+        expense = aggregates["expense"]
+        total_income = income["total"]
+        total_expenses = expense["total"]
+        monthly_income_txns = income["monthly"]
+        monthly_expenses_txns = expense["monthly"]
+        monthly_income_categories_txns = income["monthly_categories"]
+        monthly_expenses_categories_txns = expense["monthly_categories"]
+        totals_each_income_category_txns = income["categories"]
+        totals_each_expense_category_txns = expense["categories"]
+
+        with open("analysis.tsv", "w", newline="", buffering=1 << 20) as csv_file:
             csv_writer = csv.writer(csv_file, delimiter="\t")
             csv_writer.writerow(
-                ["Current Balance:", self.tracker.calc_current_balance()]
+                ["Current Balance:", f"{total_income - total_expenses:.2f}"]
             )
-            csv_writer.writerow(["Total Income:", self.tracker.get_total_income()])
-            csv_writer.writerow(["Total Expenses:", self.tracker.get_total_expenses()])
+            csv_writer.writerow(["Total Income:", f"{total_income:.2f}"])
+            csv_writer.writerow(["Total Expenses:", f"{total_expenses:.2f}"])
             csv_writer.writerow([])
             csv_writer.writerow(["Monthly Net Savings"])
 
-            for tuple_date, total in monthly_net_savings_txns.items():
-                tuple_year = tuple_date[0]
-                tuple_month = tuple_date[1]
-                csv_writer.writerow(
-                    [f"{calendar.month_name[tuple_month]} {tuple_year}:", total]
-                )
+            csv_writer.writerows(
+                [f"{MONTH_NAME[month]} {year}:", total]
+                for (year, month), total in monthly_net_savings_txns.items()
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Monthly Income"])
 
-            for tuple_date, total in monthly_income_txns.items():
-                tuple_year = tuple_date[0]
-                tuple_month = tuple_date[1]
-                csv_writer.writerow(
-                    [f"{calendar.month_name[tuple_month]} {tuple_year}:", total]
-                )
+            csv_writer.writerows(
+                [f"{MONTH_NAME[month]} {year}:", total]
+                for (year, month), total in sorted(monthly_income_txns.items())
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Monthly Expenses"])
 
-            for tuple_date, total in monthly_expenses_txns.items():
-                tuple_year = tuple_date[0]
-                tuple_month = tuple_date[1]
-                csv_writer.writerow(
-                    [f"{calendar.month_name[tuple_month]} {tuple_year}", total]
-                )
+            csv_writer.writerows(
+                [f"{MONTH_NAME[month]} {year}", total]
+                for (year, month), total in sorted(monthly_expenses_txns.items())
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Totals for Each Income Category"])
 
-            for cat, total in totals_each_income_category_txns.items():
-                csv_writer.writerow([cat, f"{total:.2f}"])
+            csv_writer.writerows(
+                [cat, f"{total:.2f}"]
+                for cat, total in sorted(totals_each_income_category_txns.items())
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Totals for Each Expense Category"])
 
-            for cat, total in totals_each_expense_category_txns.items():
-                csv_writer.writerow([cat, f"{total:.2f}"])
+            csv_writer.writerows(
+                [cat, f"{total:.2f}"]
+                for cat, total in sorted(totals_each_expense_category_txns.items())
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Monthly Income by Category"])
 
-            for combined_tuple, total in monthly_income_categories_txns.items():
-                tuple_2 = combined_tuple[0]
-                cat = combined_tuple[1]
-                tuple_year = tuple_2[0]
-                tuple_month = tuple_2[1]
-                csv_writer.writerow(
-                    [cat, f"{calendar.month_name[tuple_month]} {tuple_year}", total]
+            csv_writer.writerows(
+                [cat, f"{MONTH_NAME[month]} {year}", total]
+                for ((year, month), cat), total in sorted(
+                    monthly_income_categories_txns.items()
                 )
+            )
 
             csv_writer.writerow([])
             csv_writer.writerow(["Monthly Expenses by Category"])
 
-            for combined_tuple, total in monthly_expenses_categories_txns.items():
-                tuple_2 = combined_tuple[0]
-                cat = combined_tuple[1]
-                tuple_year = tuple_2[0]
-                tuple_month = tuple_2[1]
-                csv_writer.writerow(
-                    [cat, f"{calendar.month_name[tuple_month]} {tuple_year}", total]
+            csv_writer.writerows(
+                [cat, f"{MONTH_NAME[month]} {year}", total]
+                for ((year, month), cat), total in sorted(
+                    monthly_expenses_categories_txns.items()
                 )
+            )
 
     def export_filters(self, category, date1, date2=None):
         """
@@ -555,14 +976,7 @@ class ReportingAndAnalysis:
             csv_writer = csv.writer(csv_file, delimiter="\t")
             csv_writer.writerow([f"Transactions filter: {category}"])
 
-            for txn in category_filter_txns:
-                txn = [
-                    txn.date.strftime("%Y-%m-%d"),
-                    txn.txn_type,
-                    f"{txn.amount:.2f}",
-                    txn.category,
-                ]
-                csv_writer.writerow(txn)
+            csv_writer.writerows(txn.as_row() for txn in category_filter_txns)
 
             csv_writer.writerow([])
 
@@ -571,14 +985,7 @@ class ReportingAndAnalysis:
             else:
                 csv_writer.writerow([f"Transactions from {date1} to {date2}"])
 
-            for txn in date_filter_txns:
-                txn = [
-                    txn.date.strftime("%Y-%m-%d"),
-                    txn.txn_type,
-                    f"{txn.amount:.2f}",
-                    txn.category,
-                ]
-                csv_writer.writerow(txn)
+            csv_writer.writerows(txn.as_row() for txn in date_filter_txns)
 
             csv_writer.writerow([])
 
@@ -587,14 +994,7 @@ class ReportingAndAnalysis:
             else:
                 csv_writer.writerow([f"Income transactions from {date1} to {date2}"])
 
-            for txn in date_income_filter_txns:
-                txn = [
-                    txn.date.strftime("%Y-%m-%d"),
-                    txn.txn_type,
-                    f"{txn.amount:.2f}",
-                    txn.category,
-                ]
-                csv_writer.writerow(txn)
+            csv_writer.writerows(txn.as_row() for txn in date_income_filter_txns)
 
             csv_writer.writerow([])
 
@@ -603,14 +1003,7 @@ class ReportingAndAnalysis:
             else:
                 csv_writer.writerow([f"Expense transactions from {date1} to {date2}"])
 
-            for txn in date_expense_filter_txns:
-                txn = [
-                    txn.date.strftime("%Y-%m-%d"),
-                    txn.txn_type,
-                    f"{txn.amount:.2f}",
-                    txn.category,
-                ]
-                csv_writer.writerow(txn)
+            csv_writer.writerows(txn.as_row() for txn in date_expense_filter_txns)
 
             csv_writer.writerow([])
 
@@ -622,14 +1015,7 @@ class ReportingAndAnalysis:
                     [f"{capital_category} transactions from {date1} to {date2}"]
                 )
 
-            for txn in date_category_filter_txns:
-                txn = [
-                    txn.date.strftime("%Y-%m-%d"),
-                    txn.txn_type,
-                    f"{txn.amount:.2f}",
-                    txn.category,
-                ]
-                csv_writer.writerow(txn)
+            csv_writer.writerows(txn.as_row() for txn in date_category_filter_txns)
 
     def _chart_basis(self, method):
         """
@@ -641,26 +1027,25 @@ class ReportingAndAnalysis:
         Returns:
             tuple: (list of categories, list of totals)
         """
-        totals_each_category_txns = method
-        category_list = []
-        totals_list = []
-
-        for cat, total in totals_each_category_txns.items():
-            capital_cat = cat.capitalize()
-            category_list.append(capital_cat)
-            totals_list.append(total)
-
+        items = sorted(method.items())
+        category_list = [cat.capitalize() for cat, _ in items]
+        totals_list = [total for _, total in items]
         return category_list, totals_list
 
-    def totals_each_income_category_bar_chart(self):
-        """Display a bar chart of total income by category."""
-        tuple_1 = self._chart_basis(self.totals_each_income_category())
+    def totals_each_income_category_bar_chart(self, aggregates=None):
+        """
+        Display a bar chart of total income by category.
+
+        Args:
+            aggregates (dict, optional): Result of compute_all_aggregates.
+        """
+        plt = _pyplot()
+        if aggregates is None:
+            aggregates = self.compute_all_aggregates()
+        tuple_1 = self._chart_basis(aggregates["income"]["categories"])
         categories = tuple_1[0]
         totals = tuple_1[1]
-        positions = []
-
-        for num in range(len(categories)):
-            positions.append(num)
+        positions = range(len(categories))
 
         plt.figure(figsize=(7, 7))
         plt.bar(positions, totals, width=0.5)
@@ -671,15 +1056,20 @@ class ReportingAndAnalysis:
         plt.show()
         plt.close()
 
-    def totals_each_expense_category_bar_chart(self):
-        """Display a bar chart of total expenses by category."""
-        tuple_1 = self._chart_basis(self.totals_each_expense_category())
+    def totals_each_expense_category_bar_chart(self, aggregates=None):
+        """
+        Display a bar chart of total expenses by category.
+
+        Args:
+            aggregates (dict, optional): Result of compute_all_aggregates.
+        """
+        plt = _pyplot()
+        if aggregates is None:
+            aggregates = self.compute_all_aggregates()
+        tuple_1 = self._chart_basis(aggregates["expense"]["categories"])
         categories = tuple_1[0]
         totals = tuple_1[1]
-        positions = []
-
-        for num in range(len(categories)):
-            positions.append(num)
+        positions = range(len(categories))
 
         plt.figure(figsize=(len(categories) * 1.67 + 4, 7))
         plt.bar(positions, totals, width=0.5)
@@ -690,16 +1080,20 @@ class ReportingAndAnalysis:
         plt.show()
         plt.close()
 
-    def totals_each_income_category_pie_chart(self):
-        """Display a pie chart showing income category distribution."""
-        tuple_1 = self._chart_basis(self.totals_each_income_category())
+    def totals_each_income_category_pie_chart(self, aggregates=None):
+        """
+        Display a pie chart showing income category distribution.
+
+        Args:
+            aggregates (dict, optional): Result of compute_all_aggregates.
+        """
+        plt = _pyplot()
+        if aggregates is None:
+            aggregates = self.compute_all_aggregates()
+        tuple_1 = self._chart_basis(aggregates["income"]["categories"])
         categories = tuple_1[0]
         totals = tuple_1[1]
-        explode = []
-        num = 0
-        for i in range(len(totals)):
-            explode.append(num)
-            num += 0.045
+        explode = [i * 0.045 for i in range(len(totals))]
         fig, ax = plt.subplots(figsize=(7, 7))
         ax.pie(
             totals, labels=categories, autopct="%.2f%%", startangle=90, explode=explode
@@ -708,19 +1102,23 @@ class ReportingAndAnalysis:
         plt.show()
         plt.close()
 
-    def totals_each_expense_category_pie_chart(self):
-        """Display a pie chart showing expense category distribution."""
-        tuple_1 = self._chart_basis(self.totals_each_expense_category())
+    def totals_each_expense_category_pie_chart(self, aggregates=None):
+        """
+        Display a pie chart showing expense category distribution.
+
+        Args:
+            aggregates (dict, optional): Result of compute_all_aggregates.
+        """
+        plt = _pyplot()
+        if aggregates is None:
+            aggregates = self.compute_all_aggregates()
+        tuple_1 = self._chart_basis(aggregates["expense"]["categories"])
         categories = tuple_1[0]
         totals = tuple_1[1]
-        explode = []
-        num = 0
-        increment = 0.075
-
-        for i in range(len(totals)):
-            explode.append(num)
-            increment *= 0.7
-            num += increment
+        # Each slice is pushed out 70% as far again as the one before it.
+        explode = [
+            sum(0.075 * 0.7**k for k in range(1, i + 1)) for i in range(len(totals))
+        ]
         fig, ax = plt.subplots(figsize=(7, 7))
         ax.pie(
             totals,
@@ -733,58 +1131,44 @@ class ReportingAndAnalysis:
         plt.show()
         plt.close()
 
-    def monthly_income_and_expenses_line_graph(self):
-        """Plot a line graph of monthly income, expenses, and net savings."""
-        income_data = self.monthly_income()
-        expenses_data = self.monthly_expenses()
-        net_savings_data = self.monthly_net_savings()
-        x_income = []
-        y_income = []
-        x_expense = []
-        y_expense = []
-        x_net = []
-        y_net = []
-
-        for tuple_date, value in income_data.items():
-            year = tuple_date[0]
-            month = tuple_date[1]
-            month = calendar.month_name[month]
-            month_year = f"{month} {year}"
-            x_income.append(month_year)
-            y_income.append(value)
-
-        for tuple_date, value in expenses_data.items():
-            year = tuple_date[0]
-            month = tuple_date[1]
-            month = calendar.month_name[month]
-            month_year = f"{month} {year}"
-            x_expense.append(month_year)
-            y_expense.append(value)
-
-        for tuple_date, value in net_savings_data.items():
-            year = tuple_date[0]
-            month = tuple_date[1]
-            month = calendar.month_name[month]
-            month_year = f"{month} {year}"
-            x_net.append(month_year)
-            y_net.append(value)
+    def monthly_income_and_expenses_line_graph(self, aggregates=None):
+        """
+        Plot a line graph of monthly income, expenses, and net savings.
+
+        Args:
+            aggregates (dict, optional): Result of compute_all_aggregates.
+        """
+        plt = _pyplot()
+        if aggregates is None:
+            aggregates = self.compute_all_aggregates()
+        income_data = aggregates["income"]["monthly"]
+        expenses_data = aggregates["expense"]["monthly"]
+        net_savings_data = self._net_savings(income_data, expenses_data)
+
+        # Net savings covers every month with income or expenses, in order, so
+        # all three lines share one x axis and each label is built once.
+        months = list(net_savings_data)
+        x_months = [f"{MONTH_NAME[month]} {year}" for year, month in months]
+        y_income = [income_data.get(tuple_date, 0) for tuple_date in months]
+        y_expense = [expenses_data.get(tuple_date, 0) for tuple_date in months]
+        y_net = list(net_savings_data.values())
 
         plt.figure(figsize=(10, 7))
         plt.plot(
-            x_income,
+            x_months,
             y_income,
             label="Monthly Income",
             marker="o",
             markerfacecolor="red",
         )
         plt.plot(
-            x_expense,
+            x_months,
             y_expense,
             label="Monthly Expenses",
             marker="o",
             markerfacecolor="red",
         )
-        plt.plot(x_net, y_net, label="Net Savings", marker="o", markerfacecolor="red")
+        plt.plot(x_months, y_net, label="Net Savings", marker="o", markerfacecolor="red")
         plt.xlabel("Months")
         plt.ylabel("Dollars ($)")
         plt.title("Monthly Incomes, Expenses, and Net Savings")
@@ -793,7 +1177,174 @@ class ReportingAndAnalysis:
         plt.close()
 
 
-def main():
+def _save_history(readline):
+    """Write the prompt history to HISTORY_FILE, ignoring failures."""
+    try:
+        readline.write_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+
+
+def _setup_readline(tracker):
+    """
+    Enable prompt history and tab completion of the tracker's categories.
+
+    Does nothing if stdin is not a terminal or readline is not available.
+
+    Args:
+        tracker (FinanceTracker): Supplies the categories to complete.
+    """
+    if not sys.stdin.isatty():
+        return
+    try:
+        import readline
+    except ImportError:
+        return
+
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(1000)
+    atexit.register(_save_history, readline)
+
+    matches = []
+
+    def complete(text, state):
+        # readline asks for matches one by one, starting again at state 0.
+        if state == 0:
+            prefix = text.lower()
+            matches[:] = sorted(
+                cat for cat in tracker.categories() if cat.startswith(prefix)
+            )
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    # Complete the whole line, so categories containing spaces work.
+    readline.set_completer_delims("")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+
+def _prompt_transaction():
+    """
+    Prompt for the fields of one transaction.
+
+    Returns:
+        Transaction: The transaction that was entered.
+    """
+    date = prompt_validated(
+        "Enter date of transaction (YYYY-MM-DD): ", _typed_date, "Invalid date."
+    )
+    txn_type = prompt_validated(
+        "Enter the type of transaction (income or expense): ",
+        _typed_txn_type,
+        "Invalid type of transaction.",
+    )
+    amount = prompt_validated(
+        "Enter amount of money: ", _typed_amount, "Invalid amount."
+    )
+
+    category = _ask("Enter category of transaction: ")
+    category = category.lower()
+    return Transaction(date, txn_type, amount, category)
+
+
+def entered_transactions():
+    """
+    Yield transactions as the user enters them, until they want no more.
+
+    Yields:
+        Transaction: Each transaction, as soon as it has been entered.
+    """
+    while True:
+        yield _prompt_transaction()
+        if not yes_or_no("Would you like to enter another transaction"):
+            return
+
+
+def parse_args(argv=None):
+    """
+    Parse the command-line options for batch mode.
+
+    Args:
+        argv (list, optional): Arguments to parse. Defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: The parsed options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Personal finance tracker. Runs interactively unless --import is given."
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_path",
+        metavar="FILE",
+        help="load transactions from a .csv or .tsv file and skip all prompts",
+    )
+    parser.add_argument("--analysis", action="store_true", help="write analysis.tsv")
+    parser.add_argument(
+        "--filter",
+        dest="filter_category",
+        metavar="CATEGORY",
+        help="write filter.tsv for this category (requires --start)",
+    )
+    parser.add_argument("--start", metavar="YYYY-MM-DD", help="filter start date")
+    parser.add_argument("--end", metavar="YYYY-MM-DD", help="filter end date")
+    parser.add_argument(
+        "--charts", action="store_true", help="display the income and expense charts"
+    )
+    args = parser.parse_args(argv)
+
+    if args.import_path is None:
+        if args.analysis or args.filter_category is not None or args.charts:
+            parser.error("--analysis, --filter and --charts require --import")
+    elif not args.import_path.lower().endswith((".csv", ".tsv")):
+        parser.error("--import needs a .csv or .tsv file")
+    elif not os.path.isfile(args.import_path):
+        parser.error(f"file not found: {args.import_path}")
+    if args.filter_category is not None and args.start is None:
+        parser.error("--filter requires --start")
+    if args.filter_category is None and (args.start is not None or args.end is not None):
+        parser.error("--start and --end require --filter")
+    for date in (args.start, args.end):
+        if date is not None and not _validate_iso_date(date):
+            parser.error(f"invalid date: {date}")
+    return args
+
+
+def run_batch(args):
+    """
+    Load a transaction file and produce the requested outputs without prompting.
+
+    Args:
+        args (argparse.Namespace): Options from parse_args, with import_path set.
+    """
+    tracker = FinanceTracker()
+    storage = Storage(tracker)
+    storage.read_transaction(args.import_path)
+    # Already loaded above, so the report works from the tracker directly.
+    report = ReportingAndAnalysis(args.import_path, tracker, use_file=False)
+
+    if args.analysis:
+        report.export_analysis()
+
+    if args.filter_category is not None:
+        category = sys.intern(args.filter_category.lower())
+        report.export_filters(category, args.start, args.end)
+
+    if args.charts:
+        aggregates = report.compute_all_aggregates()
+        report.totals_each_income_category_bar_chart(aggregates)
+        report.totals_each_expense_category_bar_chart(aggregates)
+        report.totals_each_income_category_pie_chart(aggregates)
+        report.totals_each_expense_category_pie_chart(aggregates)
+        report.monthly_income_and_expenses_line_graph(aggregates)
+
+
+def main(argv=None):
     """
     Main interactive loop for the finance tracking application.
 
@@ -808,26 +1359,36 @@ def main():
     - Optionally export filtered transactions based on category and date range.
     - Optionally create and display charts of income/expense data.
 
+    With --import, runs run_batch instead and asks nothing.
+
     Assumes:
     - Storage, FinanceTracker, ReportingAndAnalysis classes exist and work as expected.
     - yes_or_no is a utility function that returns True/False from user input.
     - Dates are entered in 'YYYY-MM-DD' format.
+
+    Args:
+        argv (list, optional): Command-line arguments. Defaults to sys.argv[1:].
     """
+    args = parse_args(argv)
+    if args.import_path is not None:
+        run_batch(args)
+        return
+
     tracker = FinanceTracker()
     storage = Storage(tracker)
+    _setup_readline(tracker)
 
     # Check if user has existing CSV/TSV file and load transactions if so
     while True:
         has_csv = yes_or_no("Do you have a CSV or TSV file")
         if has_csv:
             while True:
-                filename = input("Enter file name (with .csv or .tsv at the end): ")
+                filename = _ask("Enter file name (with .csv or .tsv at the end): ")
                 if filename.lower().endswith(".csv") or filename.lower().endswith(".tsv"):
-                    try:
-                        storage.read_transaction(filename)
-                    except FileNotFoundError:
+                    if not os.path.isfile(filename):
                         print('File not found.')
                         continue
+                    storage.read_transaction(filename)
                     break
                 else:
                     print("Invalid file name.")
@@ -844,7 +1405,7 @@ def main():
     # If entering transactions and no file was specified, prompt for filename
     if inputting_txn and filename is None:
         while True:
-            filename = input(
+            filename = _ask(
                 "Enter a file name to save your transactions (with .csv or .tsv at the end): "
             )
             if filename.lower().endswith(".csv") or filename.lower().endswith(".tsv"):
@@ -852,87 +1413,58 @@ def main():
             else:
                 print("Invalid file name.")
 
-     # Input transactions loop
-    while inputting_txn:
-        # Validate date input
-        while True:
-            try:
-                date = input("Enter date of transaction (YYYY-MM-DD): ")
-                datetime.strptime(date, "%Y-%m-%d")
-                break
-            except ValueError:
-                print("Invalid date.")
-
-        # Validate transaction type input
-        txn_type_input = True
-        while txn_type_input:
-            txn_type = input("Enter the type of transaction (income or expense): ")
-            txn_type = txn_type.lower()
-            if txn_type == "income" or txn_type == "expense":
-                txn_type_input = False
-            else:
-                print("Invalid type of transaction.")
-
-        # Validate amount input
-        while True:
-            try:
-                amount = float(input("Enter amount of money: "))
-                break
-            except ValueError:
-                print("Invalid amount.")
-
-        category = input("Enter category of transaction: ")
-        category = category.lower()
-        new_txn = Transaction(date, txn_type, amount, category)
-        tracker.add_transaction(new_txn)
-        storage.append_transaction(filename, new_txn)
-        inputting_txn = yes_or_no("Would you like to enter another transaction")
+    # New transactions are saved together afterwards, including the ones
+    # completed before input ran out or was interrupted
+    pending = []
+    try:
+        if inputting_txn:
+            for new_txn in entered_transactions():
+                tracker.add_transaction(new_txn)
+                pending.append(new_txn)
+    finally:
+        if pending:
+            storage.append_transactions(filename, pending)
 
     # If any data was loaded or entered, prompt for analysis and filtering
     if has_csv or i > 0:
-        inputting_analysis = yes_or_no("Would you like an analysis TSV file")
+        flags = _report_flags()
+        inputting_analysis = _wants_report(
+            flags, REPORT_ANALYSIS, "Would you like an analysis TSV file"
+        )
 
         if inputting_analysis:
             report.export_analysis()
 
-        inputting_filter = yes_or_no("Would you like a filtered TSV file")
+        inputting_filter = _wants_report(
+            flags, REPORT_FILTER, "Would you like a filtered TSV file"
+        )
 
         if inputting_filter:
-            category = input("Enter category of transaction: ")
-            category = category.lower()
-            # Validate start date
-            while True:
-                try:
-                    date1 = input("Enter start date (YYYY-MM-DD): ")
-                    datetime.strptime(date1, "%Y-%m-%d")
-                    break
-                except ValueError:
-                    print("Invalid date.")
-
-            # Validate optional end date
-            while True:
-                try:
-                    date2 = input(
-                        "Enter end date (YYYY-MM-DD). Press enter if no end date. "
-                    )
-                    if date2 == "":
-                        date2 = None
-                        break
-                    datetime.strptime(date2, "%Y-%m-%d")
-                    break
-                except ValueError:
-                    print("Invalid date.")
+            category = _ask("Enter category of transaction: ")
+            category = sys.intern(category.lower())
+            date1 = prompt_validated(
+                "Enter start date (YYYY-MM-DD): ", _typed_date, "Invalid date."
+            )
+            # An empty end date means a single-day filter
+            date2 = prompt_validated(
+                "Enter end date (YYYY-MM-DD). Press enter if no end date. ",
+                _typed_optional_date,
+                "Invalid date.",
+            )
+            if date2 == "":
+                date2 = None
 
             report.export_filters(category, date1, date2)
 
-        create_chart = yes_or_no("Would you like some charts")
+        create_chart = _wants_report(flags, REPORT_CHARTS, "Would you like some charts")
 
         if create_chart:
-            report.totals_each_income_category_bar_chart()
-            report.totals_each_expense_category_bar_chart()
-            report.totals_each_income_category_pie_chart()
-            report.totals_each_expense_category_pie_chart()
-            report.monthly_income_and_expenses_line_graph()
+            aggregates = report.compute_all_aggregates()
+            report.totals_each_income_category_bar_chart(aggregates)
+            report.totals_each_expense_category_bar_chart(aggregates)
+            report.totals_each_income_category_pie_chart(aggregates)
+            report.totals_each_expense_category_pie_chart(aggregates)
+            report.monthly_income_and_expenses_line_graph(aggregates)
 
 
 if __name__ == "__main__":